@@ -1,15 +1,31 @@
+from importlib import import_module
+from types import MappingProxyType
+
 from .marketplayer import MarketPlayer
 from .arbitrageur import Arbitrageur
 from .banker import Banker
 from .randomizer import Randomizer
-from .centralbank import CentralBank
 from .speculator import HavvenSpeculator, NaiveSpeculator
 from .nominshorter import NominShorter, HavvenEscrowNominShorter
 from .merchant import Merchant, Buyer
 from .marketmaker import MarketMaker
 
+# players which no simulation spawns by default, only imported when first referenced
+_lazy_players = {
+    'CentralBank': '.centralbank',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_players:
+        player = getattr(import_module(_lazy_players[name], __name__), name)
+        globals()[name] = player
+        return player
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # player names for the UI sliders
-player_names = {
+player_names = MappingProxyType({
     # 'CentralBank': CentralBank,
     'Arbitrageur': Arbitrageur,
     'Banker': Banker,
@@ -21,7 +37,10 @@ player_names = {
     'Merchant': Merchant,
     'Buyer': Buyer,
     'MarketMaker': MarketMaker
-}
+})
+
+# the reverse of player_names, for bucketing agents by their class
+player_types = MappingProxyType({player: name for name, player in player_names.items()})
 
 # exclude players when showing profit %
 players_to_exclude = ["Merchant", "Buyer"]
@@ -1,4 +1,3 @@
-import random
 from decimal import Decimal as Dec
 from typing import Optional, Tuple
 
@@ -16,7 +15,7 @@ class Banker(MarketPlayer):
         """The time the order was placed as well as the fiat/hvn order"""
         self.nomin_havven_order: Optional[Tuple[int, "ob.Bid"]] = None
         self.nomin_fiat_order: Optional[Tuple[int, "ob.Ask"]] = None
-        self.sell_rate: Dec = hm.round_decimal(Dec(random.random()/3 + 0.1))
+        self.sell_rate: Dec = hm.round_decimal(Dec(self.random.random()/3 + 0.1))
         self.trade_premium: Dec = Dec('0.01')
         self.trade_duration: int = 10
         # step when initialised so nomins appear on the market.
@@ -44,7 +43,7 @@ class Banker(MarketPlayer):
                 self.fiat_havven_order = None
 
         if self.available_nomins > 0:
-            if len(self.model.datacollector.model_vars['0']) > 0:
+            if len(self.model.datacollector.model_vars['Havven Supply']) > 0:
                 havven_supply = self.model.datacollector.model_vars['Havven Supply'][-1]
                 fiat_supply = self.model.datacollector.model_vars['Fiat Supply'][-1]
                 # buy into the market with more supply, as by virtue of there being more supply,
@@ -3,7 +3,6 @@ http://www.eecs.harvard.edu/cs286r/courses/fall12/papers/OPRS10.pdf
 http://www.cs.cmu.edu/~aothman/
 """
 
-import random
 from decimal import Decimal as Dec
 from typing import Dict, Any, Optional
 
@@ -53,7 +52,7 @@ class MarketMaker(MarketPlayer):
     """
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.last_bet_end: int = random.randint(-20, 10)
+        self.last_bet_end: int = self.random.randint(-20, 10)
         '''How long since the last market maker's "bet"'''
 
         self.minimal_wait: int = 10
@@ -79,7 +78,7 @@ class MarketMaker(MarketPlayer):
         How close the bets get at the end
         '''
 
-        self.trade_market = random.choice([
+        self.trade_market = self.random.choice([
             self.havven_fiat_market,
             self.nomin_fiat_market,
             self.havven_nomin_market
@@ -1,17 +1,28 @@
-from collections import namedtuple
+from collections import deque, namedtuple
 from decimal import Decimal as Dec
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, MutableSequence, Tuple, Optional
 
 from mesa import Agent
 
 from core import orderbook as ob
 from managers import HavvenManager as hm
-from core import stats as st
 
 
 Portfolio = namedtuple(
     "Portfolio", ["fiat", "escrowed_havvens", "havvens", "nomins", "issued_nomins"])
 
+_ZERO = Dec(0)
+"""Shared zero balance; Decimals are immutable, so agents need not each own a copy."""
+
+_EPSILON = Dec('0.0005')
+"""Quantities of the quoted currency below this are not worth selling."""
+
+_BURN_TARGET_SUPPLY = Dec('10')  # Placeholder value
+"""The target supply of nomins in the market, above which nomins are burnt."""
+
+_BURN_PERCENTAGE = Dec('0.01')  # 1% burn rate
+"""The fraction of the excess supply burnt per tick."""
+
 
 class MarketPlayer(Agent):
     """
@@ -23,24 +34,36 @@ class MarketPlayer(Agent):
     """
 
     def __init__(self, unique_id: int, havven_model: "model.HavvenModel",
-                 fiat: Dec = Dec(0), havvens: Dec = Dec(0),
-                 nomins: Dec = Dec(0)) -> None:
+                 fiat: Dec = _ZERO, havvens: Dec = _ZERO,
+                 nomins: Dec = _ZERO) -> None:
         super().__init__(unique_id, havven_model)
-        self.fiat: Dec = Dec(fiat)
-        self.havvens: Dec = Dec(havvens)
-        self.nomins: Dec = Dec(nomins)
-        self.escrowed_havvens: Dec = Dec(0)
-        self.issued_nomins: Dec = Dec(0)
+        # Only convert balances which weren't already handed to us as Decimals.
+        self.fiat: Dec = fiat if type(fiat) is Dec else Dec(fiat)
+        self.havvens: Dec = havvens if type(havvens) is Dec else Dec(havvens)
+        self.nomins: Dec = nomins if type(nomins) is Dec else Dec(nomins)
+        self.escrowed_havvens: Dec = _ZERO
+        self.issued_nomins: Dec = _ZERO
 
         # values that are currently used in orders
-        self.unavailable_fiat: Dec = Dec(0)
-        self.unavailable_havvens: Dec = Dec(0)
-        self.unavailable_nomins: Dec = Dec(0)
+        self.unavailable_fiat: Dec = _ZERO
+        self.unavailable_havvens: Dec = _ZERO
+        self.unavailable_nomins: Dec = _ZERO
 
         self.initial_wealth: Dec = self.wealth()
 
         self.orders: List["ob.LimitOrder"] = []
-        self.trades: List["ob.TradeRecord"] = []
+        trade_history = havven_model.manager.trade_history
+        self.trades: MutableSequence["ob.TradeRecord"] = deque(maxlen=trade_history) if trade_history else []
+
+        # The markets are fixed for the life of the model, so bind them directly.
+        self.havven_fiat_market: "ob.OrderBook" = havven_model.market_manager.havven_fiat_market
+        """The havven-fiat market this player trades on."""
+
+        self.nomin_fiat_market: "ob.OrderBook" = havven_model.market_manager.nomin_fiat_market
+        """The nomin-fiat market this player trades on."""
+
+        self.havven_nomin_market: "ob.OrderBook" = havven_model.market_manager.havven_nomin_market
+        """The havven-nomin market this player trades on."""
 
     def __str__(self) -> str:
         return self.name
@@ -52,21 +75,6 @@ class MarketPlayer(Agent):
         """
         pass
 
-    @property
-    def havven_fiat_market(self) -> "ob.OrderBook":
-        """The havven-fiat market this player trades on."""
-        return self.model.market_manager.havven_fiat_market
-
-    @property
-    def nomin_fiat_market(self) -> "ob.OrderBook":
-        """The nomin-fiat market this player trades on."""
-        return self.model.market_manager.nomin_fiat_market
-
-    @property
-    def havven_nomin_market(self) -> "ob.OrderBook":
-        """The havven-nomin market this player trades on."""
-        return self.model.market_manager.havven_nomin_market
-
     @property
     def name(self) -> str:
         """
@@ -82,12 +90,16 @@ class MarketPlayer(Agent):
         """
         return max(hm.round_decimal(qty / divisor), min(minimum, qty))
 
-    def cancel_orders(self) -> None:
+    def cancel_orders(self, orders: Optional[Iterable["ob.LimitOrder"]] = None) -> None:
         """
-        Cancel all of this agent's orders.
+        Cancel the given orders of this agent, or all of its orders if none are given.
+        Orders are cancelled in one batch per order book.
         """
-        for order in list(self.orders):
-            order.cancel()
+        by_book: Dict["ob.OrderBook", List["ob.LimitOrder"]] = {}
+        for order in (self.orders if orders is None else orders):
+            by_book.setdefault(order.book, []).append(order)
+        for book, book_orders in by_book.items():
+            book.cancel_orders(book_orders)
 
     def wealth(self) -> Dec:
         """
@@ -111,14 +123,15 @@ class MarketPlayer(Agent):
         issued_nomins = self.issued_nomins
 
         if fiat_values:
-            v_f = self.model.fiat_value
-            havvens = v_f(havvens=havvens)
-            escrowed_havvens = v_f(havvens=escrowed_havvens)
-            nomins = v_f(nomins=nomins)
-            issued_nomins = v_f(nomins=issued_nomins)
+            havven_price, nomin_price = self.model.fiat_prices()
+            value_at = self.model.market_manager.value_at
+            havvens = value_at(havvens, havven_price)
+            escrowed_havvens = value_at(escrowed_havvens, havven_price)
+            nomins = value_at(nomins, nomin_price)
+            issued_nomins = value_at(issued_nomins, nomin_price)
 
-        return Portfolio(fiat=fiat, havvens=havvens, escrowed_havvens=escrowed_havvens,
-                         nomins=nomins, issued_nomins=issued_nomins)
+        # Positional construction skips keyword argument parsing.
+        return Portfolio(fiat, escrowed_havvens, havvens, nomins, issued_nomins)
 
     def reset_initial_wealth(self) -> Dec:
         """
@@ -143,7 +156,7 @@ class MarketPlayer(Agent):
         if hm.round_decimal(self.initial_wealth) != 0:
             return hm.round_decimal(self.profit() / self.initial_wealth)
         else:
-            return Dec('0')
+            return _ZERO
 
     def transfer_fiat_to(self, recipient: "MarketPlayer",
                          value: Dec) -> bool:
@@ -228,28 +241,36 @@ class MarketPlayer(Agent):
         """
         Sell a quantity of the quoted currency into the given market.
         """
-        remaining_quoted = self.__getattribute__(f"available_{book.quoted}")
+        # Resolve the book's methods once, rather than on every iteration.
+        available = book.available_quoted
+        round_decimal = hm.round_decimal
+        lowest_ask_quantity = book.lowest_ask_quantity
+        lowest_ask_price = book.lowest_ask_price
+
+        remaining_quoted = available(self)
         quantity = min(quantity, remaining_quoted)
-        if quantity < Dec('0.0005'): # TODO: remove workaround, and/or factor into epsilon variable
+        if quantity < _EPSILON: # TODO: remove workaround
             return None
 
-        next_qty = hm.round_decimal(min(quantity, book.lowest_ask_quantity()) / book.lowest_ask_price())
-        pre_sold = self.__getattribute__(f"available_{book.quoted}")
+        next_qty = round_decimal(min(quantity, lowest_ask_quantity()) / lowest_ask_price())
         bid = book.buy(next_qty, self)
-        total_sold = pre_sold - self.__getattribute__(f"available_{book.quoted}")
+        # The balance after each purchase is the starting balance of the next one.
+        post_sold = available(self)
+        total_sold = remaining_quoted - post_sold
 
         # Keep on bidding until we either run out of reserves or sellers, or we've bought enough.
         while bid is not None and not bid.active and total_sold < quantity and len(book.asks) == 0:
-            next_qty = hm.round_decimal(min(quantity - total_sold, book.lowest_ask_quantity()) / book.lowest_ask_price())
-            pre_sold = self.__getattribute__(f"available_{book.quoted}")
+            next_qty = round_decimal(min(quantity - total_sold, lowest_ask_quantity()) / lowest_ask_price())
+            pre_sold = post_sold
             bid = book.buy(next_qty, self)
-            total_sold += pre_sold - self.__getattribute__(f"available_{book.quoted}")
+            post_sold = available(self)
+            total_sold += pre_sold - post_sold
 
         if total_sold < quantity:
             if bid is not None:
                 bid.cancel()
-            price = book.lowest_ask_price()
-            bid = book.bid(price, hm.round_decimal((quantity - total_sold) / price), self)
+            price = lowest_ask_price()
+            bid = book.bid(price, round_decimal((quantity - total_sold) / price), self)
 
         return bid
 
@@ -439,21 +460,21 @@ class MarketPlayer(Agent):
         """
         This agent's quantity of fiat not tied up in orders.
         """
-        return self.model.manager.round_decimal(self.fiat - self.unavailable_fiat)
+        return (self.fiat - self.unavailable_fiat).quantize(hm.currency_quantum)
 
     @property
     def available_havvens(self) -> Dec:
         """
         This agent's quantity of havvens not being tied up in orders.
         """
-        return self.model.manager.round_decimal(self.havvens - self.unavailable_havvens)
+        return (self.havvens - self.unavailable_havvens).quantize(hm.currency_quantum)
 
     @property
     def available_nomins(self) -> Dec:
         """
         This agent's quantity of nomins not being tied up in orders.
         """
-        return self.model.manager.round_decimal(self.nomins - self.unavailable_nomins)
+        return (self.nomins - self.unavailable_nomins).quantize(hm.currency_quantum)
 
     def round_values(self) -> None:
         """
@@ -482,38 +503,34 @@ class MarketPlayer(Agent):
         """
         # Calculate how many nomins to burn this step
         nomins_to_burn = self.calculate_burn_rate()
-        print("in step function of makrketplayer : nomins to burn" , nomins_to_burn)
 
         # Burn the calculated amount of nomins
-        if nomins_to_burn > Dec('0'):
+        if nomins_to_burn > _ZERO:
             self.burn_nomins(nomins_to_burn)
     
-    def calculate_burn_rate(self) -> Dec:
+    @staticmethod
+    def burn_fraction(current_supply: Dec) -> Dec:
         """
-        Calculate the burn rate based on the excess supply of nomins in the market.
-        The excess supply could be determined by the difference between the current supply and a target supply.
-        This is a simplified example for demonstration purposes.
+        Return the fraction of its excess nomins each agent should burn, given the
+        current supply of nomins in the market.
+        This is the same for every agent, so the model computes it once per tick.
         """
-        # Define target supply for nomins (could be set based on market conditions or predefined)
-        target_supply = Dec('10')  # Placeholder value
-
-         # Get the current supply from the stats module function
-        current_supply = Dec(st.nomin_supply(self.model))
-
         # If current supply is zero, we cannot perform division, so set burn rate to zero
-        if current_supply == Dec('0'):
-            return Dec('0')
+        if current_supply == _ZERO:
+            return _ZERO
 
-        # Calculate excess supply
-        excess_supply = max(current_supply - target_supply, Dec('0'))
+        # Calculate excess supply over the target
+        excess_supply = max(current_supply - _BURN_TARGET_SUPPLY, _ZERO)
 
-        # Define a burn percentage, which could be a system parameter
-        burn_percentage = Dec('0.01')  # 1% burn rate
+        # Each agent burns in proportion to its share of the current supply
+        return _BURN_PERCENTAGE * excess_supply / current_supply
 
+    def calculate_burn_rate(self) -> Dec:
+        """
+        Calculate the burn rate based on the excess supply of nomins in the market.
+        The excess supply could be determined by the difference between the current supply and a target supply.
+        This is a simplified example for demonstration purposes.
+        """
         # Calculate the burn amount based on the burn rate and the agent's proportion of the excess supply
-        agent_excess_nomins = max(self.nomins - self.issued_nomins, Dec('0'))
-        # print("agent_excess_nomins" , agent_excess_nomins)
-        agent_burn_amount = burn_percentage * (agent_excess_nomins / current_supply) * excess_supply
-        # print("agent_burn_amount " , agent_burn_amount)
-
-        return agent_burn_amount
+        agent_excess_nomins = max(self.nomins - self.issued_nomins, _ZERO)
+        return self.model.nomin_burn_fraction * agent_excess_nomins
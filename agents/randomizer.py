@@ -1,11 +1,13 @@
 """agents.py: Individual agents that will interact with the Havven market."""
-import random
 from decimal import Decimal as Dec
 
 from core import orderbook as ob
 from managers import HavvenManager as hm
 from .marketplayer import MarketPlayer
 
+_ORDER_DIVISOR = Dec(10)
+"""Each order commits at most a tenth of the relevant available balance."""
+
 
 class Randomizer(MarketPlayer):
     """Places random bids and asks near current market prices."""
@@ -37,11 +39,10 @@ class Randomizer(MarketPlayer):
         for order in self.orders:
             if order.book.time > order.time + self.order_lifetime:
                 condemned.append(order)
-        for order in condemned:
-            order.cancel()
+        self.cancel_orders(condemned)
 
         if len(self.orders) < self.max_orders:
-            action = random.choice([self._havven_fiat_bid, self._havven_fiat_ask,
+            action = self.random.choice([self._havven_fiat_bid, self._havven_fiat_ask,
                                     self._nomin_fiat_bid, self._nomin_fiat_ask,
                                     self._havven_nomin_bid, self._havven_nomin_ask])
             if action() is None:
@@ -49,30 +50,30 @@ class Randomizer(MarketPlayer):
 
     def _havven_fiat_bid(self) -> "ob.Bid":
         price = self.havven_fiat_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_havven_fiat_bid(self._fraction(self.available_fiat, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_havven_fiat_bid(self._fraction(self.available_fiat, _ORDER_DIVISOR), price + movement)
 
     def _havven_fiat_ask(self) -> "ob.Ask":
         price = self.havven_fiat_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_havven_fiat_ask(self._fraction(self.available_havvens, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_havven_fiat_ask(self._fraction(self.available_havvens, _ORDER_DIVISOR), price + movement)
 
     def _nomin_fiat_bid(self) -> "ob.Bid":
         price = self.nomin_fiat_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_nomin_fiat_bid(self._fraction(self.available_fiat, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_nomin_fiat_bid(self._fraction(self.available_fiat, _ORDER_DIVISOR), price + movement)
 
     def _nomin_fiat_ask(self) -> "ob.Ask":
         price = self.nomin_fiat_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_nomin_fiat_ask(self._fraction(self.available_nomins, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_nomin_fiat_ask(self._fraction(self.available_nomins, _ORDER_DIVISOR), price + movement)
 
     def _havven_nomin_bid(self) -> "ob.Bid":
         price = self.havven_nomin_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_havven_nomin_bid(self._fraction(self.available_nomins, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_havven_nomin_bid(self._fraction(self.available_nomins, _ORDER_DIVISOR), price + movement)
 
     def _havven_nomin_ask(self) -> "ob.Ask":
         price = self.havven_nomin_market.price
-        movement = hm.round_decimal(Dec(2*random.random() - 1) * price * self.variance)
-        return self.place_havven_nomin_ask(self._fraction(self.available_havvens, Dec(10)), price + movement)
+        movement = hm.round_decimal(Dec(2*self.random.random() - 1) * price * self.variance)
+        return self.place_havven_nomin_ask(self._fraction(self.available_havvens, _ORDER_DIVISOR), price + movement)
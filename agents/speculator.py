@@ -1,4 +1,3 @@
-import random
 from decimal import Decimal as Dec
 from typing import Tuple, Optional, Callable
 
@@ -21,23 +20,23 @@ class Speculator(MarketPlayer):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.risk_factor = Dec(random.random()/5+0.05)    # (5-25)%
+        self.risk_factor = Dec(self.random.random()/5+0.05)    # (5-25)%
         """How likely is the speculator going to place a trade if he
         doesn't have an active one"""
 
-        self.hold_duration = Dec(random.randint(20, 30))
+        self.hold_duration = Dec(self.random.randint(20, 30))
         """How long a speculator wants to hodl onto a trade"""
 
-        self.profit_goal = Dec(random.random()/10 + 0.01)  # (1-2)%
+        self.profit_goal = Dec(self.random.random()/10 + 0.01)  # (1-2)%
         """How much a speculator wants to profit on any trade"""
 
-        self.loss_cutoff = Dec(random.random()/20 + 0.01)  # (1-1.5)%
+        self.loss_cutoff = Dec(self.random.random()/20 + 0.01)  # (1-1.5)%
         """At what point does the speculator get rid of a trade"""
 
-        self.investment_fraction = Dec(random.random()/10 + 0.4)  # (40-50)%
+        self.investment_fraction = Dec(self.random.random()/10 + 0.4)  # (40-50)%
         """How much wealth does the speculator throw into a trade"""
 
-        self.primary_currency = random.choice(["havvens", "fiat", "nomins"])
+        self.primary_currency = self.random.choice(["havvens", "fiat", "nomins"])
         self.set_avail_primary()
 
     @property
@@ -60,14 +59,13 @@ class Speculator(MarketPlayer):
             raise Exception(f"currency:{self.primary_currency} isn't in [havvens, fiat, nomins]")
 
     def setup(self, init_value):
+        endowment = self.model.manager.round_decimal(init_value * Dec(3))
         if self.primary_currency == "fiat":
-            self.fiat = self.model.manager.round_decimal(init_value * Dec(3))
+            self.fiat = endowment
         elif self.primary_currency == "nomins":
-            self.fiat = self.model.manager.round_decimal(init_value * Dec(3))
+            self.fiat = endowment
         elif self.primary_currency == "havvens":
-            self.model.endow_havvens(
-                self, self.model.manager.round_decimal(init_value * Dec(3))
-            )
+            self.model.endow_havvens(self, endowment)
 
     def _check_trade_profit(self, initial_price, time_bought, order, direction) -> bool:
         """
@@ -137,7 +135,7 @@ class Speculator(MarketPlayer):
         Making a trade involves buying into one of the markets, then deciding on a price
         to sell.
         """
-        if random.random() < self.risk_factor:
+        if self.random.random() < self.risk_factor:
             if direction == "ask":
                 price = market.highest_bid_price()
                 bid = market.bid(price, self.avail_primary()*self.investment_fraction, self)
@@ -190,7 +188,7 @@ class HavvenSpeculator(Speculator):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
-        self.primary_currency = random.choice(["havvens", "havvens", "fiat", "nomins"])
+        self.primary_currency = self.random.choice(["havvens", "havvens", "fiat", "nomins"])
         # give an equal chance to short/long havvens
         self.change_currency()
 
@@ -207,7 +205,7 @@ class HavvenSpeculator(Speculator):
             self.set_avail_primary()
 
         if self.primary_currency == "havvens":
-            self.secondary_currency = random.choice(["fiat", "nomins"])
+            self.secondary_currency = self.random.choice(["fiat", "nomins"])
             self.direction = "bid"
             if self.secondary_currency == "fiat":
                 self.market = self.havven_fiat_market
@@ -1,9 +1,10 @@
 """model.py: The Havven model itself lives here."""
 
 from decimal import Decimal as Dec
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
 
-from mesa import Model
+import numpy as np
+from mesa import Agent, Model
 from mesa.time import RandomActivation
 
 import agents as ag
@@ -13,6 +14,42 @@ from managers import (HavvenManager, MarketManager,
 from core import stats
 
 
+class FastRandomActivation(RandomActivation):
+    """
+    A RandomActivation scheduler which draws each step's activation order
+      as a NumPy permutation, rather than shuffling the agent keys in Python.
+    Agents added or removed during a step are handled as in Mesa's agent_buffer.
+    """
+    def __init__(self, model: Model) -> None:
+        super().__init__(model)
+        # Seeded from the model's own generator, so runs stay reproducible.
+        self.rng = np.random.default_rng(model.random.getrandbits(64))
+
+    def extend(self, agents: Iterable[Agent]) -> None:
+        """
+        Add several agents to the schedule with a single update.
+        Like add, this refuses unique ids that are already scheduled, or repeated among the agents.
+        """
+        agents = list(agents)
+        added = {agent.unique_id: agent for agent in agents}
+        if len(added) != len(agents):
+            raise Exception("Some of these agents share a unique id")
+        if not self._agents.keys().isdisjoint(added):
+            raise Exception("Some of these agents' unique ids were already added to the scheduler")
+        self._agents.update(added)
+
+    def step(self) -> None:
+        """Execute the step of all agents, one at a time, in random order."""
+        scheduled = self._agents
+        agent_keys = list(scheduled.keys())
+        for i in self.rng.permutation(len(agent_keys)).tolist():
+            agent_key = agent_keys[i]
+            if agent_key in scheduled:
+                scheduled[agent_key].step()
+        self.steps += 1
+        self.time += 1
+
+
 class HavvenModel(Model):
     """
     An agent-based model of the Havven stablecoin system. This class will
@@ -26,7 +63,8 @@ class HavvenModel(Model):
                  model_settings: Dict[str, Any],
                  fee_settings: Dict[str, Any],
                  agent_settings: Dict[str, Any],
-                 havven_settings: Dict[str, Any]) -> None:
+                 havven_settings: Dict[str, Any],
+                 *, seed: Optional[int] = None) -> None:
         """
 
         :param model_settings: Setting that are modifiable on the frontend
@@ -35,24 +73,41 @@ class HavvenModel(Model):
          - utilisation_ratio_max: the max utilisation ratio for nomin issuance against havvens
          - continuous_order_matching: whether to match orders as they come,
          or at the end of each tick
+         - collect_period: collect data every this many ticks, 1 by default
         :param fee_settings: explained in feemanager.py
         :param agent_settings: explained in agentmanager.py
         :param havven_settings: explained in havvenmanager.py
+        :param seed: seeds the model's random generator, which the scheduler and
+          every agent draw from; keyword-only, as Mesa only looks for it by name
         """
         agent_fractions = model_settings['agent_fractions']
         num_agents = model_settings['num_agents']
         utilisation_ratio_max = model_settings['utilisation_ratio_max']
         continuous_order_matching = model_settings['continuous_order_matching']
+        # The frontend only passes the settings it exposes, so this one may be absent.
+        self.collect_period: int = model_settings.get('collect_period', 1)
+        if self.collect_period < 1:
+            raise ValueError(f"collect_period must be at least 1, got {self.collect_period}")
 
         # Mesa setup.
         super().__init__()
+        # Seed explicitly too, before anything draws from the generator,
+        #   rather than relying on how Mesa's Model.__new__ reads the seed.
+        if seed is not None:
+            self.reset_randomizer(seed)
 
         # The schedule will activate agents in a random order per step.
-        self.schedule = RandomActivation(self)
+        self.schedule = FastRandomActivation(self)
 
         # Set up data collection.
         self.datacollector = stats.create_datacollector()
 
+        # Every agent's wealth, snapshotted once while data is being collected.
+        self.wealth_snapshot: Optional[np.ndarray] = None
+
+        # The mean profit percentages overall and per player type, likewise.
+        self.profit_snapshot: Optional[Tuple[float, Dict[str, float]]] = None
+
         # Initialise simulation managers.
         self.manager = HavvenManager(
             Dec(utilisation_ratio_max),
@@ -63,9 +118,21 @@ class HavvenModel(Model):
             self.manager,
             fee_settings
         )
+        # Fees are distributed every fee_period ticks; the period is fixed for the model's lifetime.
+        self.fee_period: int = self.fee_manager.fee_period
         self.market_manager = MarketManager(self.manager, self.fee_manager)
         self.mint = Mint(self.manager, self.market_manager)
 
+        # The order books to match at the end of each tick; none if orders are matched as they come.
+        self.markets_to_match: Tuple["ob.OrderBook", ...] = \
+            () if continuous_order_matching else self.market_manager.markets
+
+        # The quantity of nomins on sale in the markets, and the fraction of their
+        # excess nomins agents burn as a result, refreshed once per tick
+        # so that agents needn't each recompute them.
+        self.market_nomin_supply: Dec = Dec(stats.nomin_supply(self))
+        self.nomin_burn_fraction: Dec = ag.MarketPlayer.burn_fraction(self.market_nomin_supply)
+
         self.agent_manager = AgentManager(
             self,
             num_agents,
@@ -76,8 +143,14 @@ class HavvenModel(Model):
     def fiat_value(self, havvens=Dec('0'), nomins=Dec('0'),
                    fiat=Dec('0')) -> Dec:
         """Return the equivalent fiat value of the given currency basket."""
-        return self.market_manager.havvens_to_fiat(havvens) + \
-            self.market_manager.nomins_to_fiat(nomins) + fiat
+        havven_price, nomin_price = self.fiat_prices()
+        value_at = self.market_manager.value_at
+        return value_at(havvens, havven_price) + value_at(nomins, nomin_price) + fiat
+
+    def fiat_prices(self) -> Tuple[Dec, Dec]:
+        """Return the current fiat prices of a havven and of a nomin."""
+        return self.market_manager.havven_fiat_market.price, \
+            self.market_manager.nomin_fiat_market.price
 
     def endow_havvens(self, agent: "ag.MarketPlayer", havvens: Dec) -> None:
         """Grant an agent an endowment of havvens."""
@@ -88,25 +161,34 @@ class HavvenModel(Model):
 
     def step(self) -> None:
         """Advance the model by one step."""
+        self.market_nomin_supply = Dec(stats.nomin_supply(self))
+        self.nomin_burn_fraction = ag.MarketPlayer.burn_fraction(self.market_nomin_supply)
+
         # Agents submit trades.
         self.schedule.step()
 
-        self.market_manager.havven_nomin_market.step_history()
-        self.market_manager.havven_fiat_market.step_history()
-        self.market_manager.nomin_fiat_market.step_history()
+        for market in self.market_manager.markets:
+            market.step_history()
 
         # Resolve outstanding trades.
-        if not self.manager.continuous_order_matching:
-            self.market_manager.havven_nomin_market.match()
-            self.market_manager.havven_fiat_market.match()
-            self.market_manager.nomin_fiat_market.match()
+        # The books share agents' balances and the fee pool, so they are matched in turn.
+        for market in self.markets_to_match:
+            market.match()
 
         # Distribute fees periodically.
-        if (self.manager.time % self.fee_manager.fee_period) == 0:
-            self.fee_manager.distribute_fees(self.schedule.agents)
-
-        # Collect data.
-        self.datacollector.collect(self)
+        if (self.manager.time % self.fee_period) == 0:
+            self.fee_manager.distribute_fees(self.schedule.agents, self.random)
+
+        # Collect data, valuing each agent only once for all the wealth and profit reporters.
+        if (self.manager.time % self.collect_period) == 0:
+            self.wealth_snapshot = stats.agent_wealths(self)
+            self.profit_snapshot = stats.profit_percentages(self)
+            try:
+                self.datacollector.collect(self)
+            finally:
+                # Never leave a stale snapshot behind, even if a reporter fails.
+                self.wealth_snapshot = None
+                self.profit_snapshot = None
 
         # Advance Time Itself.
         self.manager.time += 1
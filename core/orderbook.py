@@ -4,6 +4,7 @@ from typing import Iterable, Callable, List, Optional, Tuple
 from decimal import Decimal as Dec
 from itertools import takewhile
 from collections import namedtuple
+from operator import attrgetter
 
 # We need a fast ordered data structure to support efficient insertion and deletion of orders.
 from sortedcontainers import SortedListWithKey, SortedDict
@@ -212,6 +213,11 @@ class OrderBook:
         self.base = base
         self.quoted = quote
 
+        # Fetch an agent's available quantity of either currency,
+        # without formatting the attribute name on every order.
+        self.available_base: Callable[["ag.MarketPlayer"], Dec] = attrgetter(f"available_{base}")
+        self.available_quoted: Callable[["ag.MarketPlayer"], Dec] = attrgetter(f"available_{quote}")
+
         # Buys and sells should be ordered, by price first, then date.
         # Bids are ordered highest-first
         self.bids = SortedListWithKey(key=Bid.comparator)
@@ -279,8 +285,10 @@ class OrderBook:
         total = Dec(0)
         counted = 0
 
+        # Trades completed before this time fall outside the window.
+        cutoff = self.model_manager.time - time_window
         for item in reversed(self.history):
-            if item.completion_time < self.model_manager.time - time_window:
+            if item.completion_time < cutoff:
                 break
             total += item.price
             counted += 1
@@ -300,8 +308,10 @@ class OrderBook:
         total = Dec(0)
         counted_vol = Dec(0)
 
+        # Trades completed before this time fall outside the window.
+        cutoff = self.model_manager.time - time_window
         for item in reversed(self.history):
-            if item.completion_time < self.model_manager.time - time_window:
+            if item.completion_time < cutoff:
                 break
             total += item.price * item.quantity
             counted_vol += item.quantity
@@ -415,7 +425,7 @@ class OrderBook:
 
         # Fail if the value of the order exceeds the agent's available supply.
         agent.round_values()
-        if agent.__getattribute__(f"available_{self.quoted}") < HavvenManager.round_decimal(price*quantity) + fee:
+        if self.available_quoted(agent) < HavvenManager.round_decimal(price*quantity) + fee:
             return None
 
         bid = Bid(price, quantity, fee, agent, self)
@@ -441,7 +451,7 @@ class OrderBook:
 
         # Fail if the value of the order exceeds the agent's available supply.
         agent.round_values()
-        if agent.__getattribute__(f"available_{self.base}") < quantity + fee:
+        if self.available_base(agent) < quantity + fee:
             return None
 
         ask = Ask(price, quantity, fee, agent, self)
@@ -701,18 +711,25 @@ class OrderBook:
         if not bid.active:
             return
 
+        self._remove_bid(bid)
+        bid.issuer.orders.remove(bid)
+        bid.issuer.notify_cancelled(bid)
+
+    def _remove_bid(self, bid: Bid) -> None:
+        """
+        Strike an active bid off the book, releasing its issuer's tokens,
+        but leave the issuer's own order list untouched.
+        """
         # Free up tokens occupied by this bid.
         bid.issuer.__dict__[f"unavailable_{self.quoted}"] -= bid.quantity * bid.price + bid.fee
 
         # Remove this order's remaining quantity from its price bucket
         self._bid_bucket_deduct(bid.price, bid.quantity)
 
-        # Delete the order from the ask list and issuer.
+        # Delete the order from the bid list.
         self.bids.remove(bid)
-        bid.issuer.orders.remove(bid)
         bid.active = False
         self.step()
-        bid.issuer.notify_cancelled(bid)
 
     def add_new_ask(self, ask: Ask) -> None:
         """
@@ -817,18 +834,49 @@ class OrderBook:
         if not ask.active:
             return
 
-        # Free up tokens occupied by this bid.
+        self._remove_ask(ask)
+        ask.issuer.orders.remove(ask)
+        ask.issuer.notify_cancelled(ask)
+
+    def _remove_ask(self, ask: Ask) -> None:
+        """
+        Strike an active ask off the book, releasing its issuer's tokens,
+        but leave the issuer's own order list untouched.
+        """
+        # Free up tokens occupied by this ask.
         ask.issuer.__dict__[f"unavailable_{self.base}"] -= ask.quantity + ask.fee
 
         # Remove this order's remaining quantity from its price bucket.
         self._ask_bucket_deduct(ask.price, ask.quantity)
 
-        # Delete order from the ask list and issuer.
+        # Delete order from the ask list.
         self.asks.remove(ask)
-        ask.issuer.orders.remove(ask)
         ask.active = False
         self.step()
-        ask.issuer.notify_cancelled(ask)
+
+    def cancel_orders(self, orders: Iterable[LimitOrder]) -> None:
+        """
+        Cancel a batch of orders listed on this book.
+        This is equivalent to cancelling each order in turn, except that each
+        issuer's order list is rebuilt once, rather than searched once per order.
+        """
+        cancelled = []
+        for order in orders:
+            # Skip orders that are already inactive, as the single cancels do.
+            if not order.active:
+                continue
+            if isinstance(order, Bid):
+                self._remove_bid(order)
+            else:
+                self._remove_ask(order)
+            cancelled.append(order)
+
+        # Only inactive orders were removed, so keep just the active ones.
+        for issuer in {order.issuer: None for order in cancelled}:
+            issuer.orders[:] = [order for order in issuer.orders if order.active]
+
+        for order in cancelled:
+            order.issuer.notify_cancelled(order)
 
     def match(self) -> None:
         """Match bids with asks and perform any trades that can be made."""
@@ -201,7 +201,8 @@ def make_server() -> "tornado.web.Application":
 
     "Label": "0"/"1" is a workaround to show the graph label where there is only one label
       (the graphs with only one label wont show the label value, and also show multiple
-      values at the same time)
+      values at the same time); they aren't collected, ChartModule draws labels without
+      a reporter as 0
     """
     settings = settingsloader.load_settings()
 
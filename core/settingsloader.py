@@ -32,6 +32,10 @@ def get_defaults():
             'random_agents': False,
             'utilisation_ratio_max': '0.25',
             'continuous_order_matching': True,
+
+            # collect data every this many steps; the visualisations render the
+            # latest collected data each step, so leave this at 1 for the server
+            'collect_period': 1,
         },
         'Fees': {
             'fee_period': 50,
@@ -62,7 +66,11 @@ def get_defaults():
             'havven_supply': '1000000000',
             'nomin_supply': '0',
             'rolling_avg_time_window': 7,
-            'use_volume_weighted_avg': True
+            'use_volume_weighted_avg': True,
+
+            # the number of trades each player remembers, 0 to keep them all
+            # (the past orders graph totals every trade, so it needs them all)
+            'trade_history': 0
         },
         'AgentDescriptions': {
             "Arbitrageur": "The arbitrageur finds arbitrage cycles and profits off them",
@@ -1,8 +1,8 @@
 """stats.py: Functions for extracting aggregate information from the Havven model."""
 
-from statistics import stdev
-from typing import List, Any
+from typing import Dict, List, Any, Tuple
 
+import numpy as np
 from mesa.datacollection import DataCollector
 
 import agents
@@ -22,53 +22,82 @@ def _profit_excluded(name: str) -> bool:
     return name in agents.players_to_exclude
 
 
-def mean_profit_fraction(havven_model: "model.HavvenModel") -> float:
+def profit_fractions(havven_model: "model.HavvenModel") -> Tuple[float, Dict[str, float]]:
     """
     Return the average fraction of profit being made by market participants,
-    excluding Merchants and Buyers.
+    and by each type of player, computing each agent's profit only once.
     """
-    if len(havven_model.schedule.agents) == 0:
-        return 0
-    return float(mean([a.profit_fraction() for a in havven_model.schedule.agents
-                 if not _profit_excluded(a)]))
+    # The agent manager already buckets every agent by player type.
+    overall: List[Any] = []
+    by_name: Dict[str, float] = {name: 0.0 for name in agents.player_names}
+    for name, bucket in havven_model.agent_manager.agents.items():
+        fractions = [a.profit_fraction() for a in bucket]
+        overall.extend(f for a, f in zip(bucket, fractions) if not _profit_excluded(a))
+        if name in by_name:
+            by_name[name] = float(mean(fractions))
 
+    return float(mean(overall)), by_name
 
-def mean_agent_profit_fraction(name: str, havven_model: "model.HavvenModel"):
-    if len(havven_model.agent_manager.agents[name]) == 0:
-        return 0
-    return float(mean([a.profit_fraction() for a in havven_model.agent_manager.agents[name]]))
+
+def profit_percentages(havven_model: "model.HavvenModel") -> Tuple[float, Dict[str, float]]:
+    """
+    Return profit_fractions as percentages rounded to 3 places, as reported.
+    While data is being collected this is the result snapshotted by the model,
+    so the profit reporters share a single pass over the agents.
+    """
+    if havven_model.profit_snapshot is not None:
+        return havven_model.profit_snapshot
+
+    overall, by_name = profit_fractions(havven_model)
+    return round(100 * overall, 3), {name: round(100 * f, 3) for name, f in by_name.items()}
+
+
+def agent_wealths(havven_model: "model.HavvenModel") -> np.ndarray:
+    """
+    Return the wealth of every agent in the market, as an array of floats.
+    While data is being collected this is the array snapshotted by the model,
+    so the wealth reporters share a single pass over the agents.
+    """
+    if havven_model.wealth_snapshot is not None:
+        return havven_model.wealth_snapshot
+    schedule_agents = havven_model.schedule.agents
+    return np.fromiter((a.wealth() for a in schedule_agents),
+                       dtype=np.float64, count=len(schedule_agents))
 
 
 def wealth_sd(havven_model: "model.HavvenModel") -> float:
     """Return the standard deviation of wealth in the market."""
-    return float(stdev([a.wealth() for a in havven_model.schedule.agents]))
+    return float(agent_wealths(havven_model).std(ddof=1))
 
 
 def gini(havven_model: "model.HavvenModel") -> float:
     """Return the gini coefficient in the market."""
-    n = len(havven_model.schedule.agents)
-    s_wealth = sorted([a.wealth() for a in havven_model.schedule.agents])
-    total_wealth = float(sum(s_wealth))
+    wealths = agent_wealths(havven_model)
+    n = len(wealths)
+    s_wealth = np.sort(wealths)
+    total_wealth = float(s_wealth.sum())
     if total_wealth == 0 or n == 0:
         return 0
-    scaled_wealth = float(sum([(i+1)*w for i, w in enumerate(s_wealth)]))
+    scaled_wealth = float(np.arange(1, n + 1) @ s_wealth)
     return (2.0*scaled_wealth)/(n*total_wealth) - (n+1.0)/n
 
 
 def max_wealth(havven_model: "model.HavvenModel") -> float:
     """Return the wealth of the richest person in the market."""
-    if len(havven_model.schedule.agents) == 0:
+    wealths = agent_wealths(havven_model)
+    if len(wealths) == 0:
         return 0
 
-    return float(max([a.wealth() for a in havven_model.schedule.agents]))
+    return float(wealths.max())
 
 
 def min_wealth(havven_model: "model.HavvenModel") -> float:
     """Return the wealth of the poorest person in the market."""
-    if len(havven_model.schedule.agents) == 0:
+    wealths = agent_wealths(havven_model)
+    if len(wealths) == 0:
         return 0
 
-    return float(min([a.wealth() for a in havven_model.schedule.agents]))
+    return float(wealths.min())
 
 
 def fiat_demand(havven_model: "model.HavvenModel") -> float:
@@ -113,46 +142,139 @@ def nomin_supply(havven_model: "model.HavvenModel") -> float:
     return havvens + fiat
 
 
+def nomin_price(havven_model: "model.HavvenModel") -> float:
+    """Return the rolling average nomin/fiat price."""
+    return float(havven_model.market_manager.nomin_fiat_market.price)
+
+
+def nomin_ask(havven_model: "model.HavvenModel") -> float:
+    """Return the lowest nomin/fiat ask price."""
+    return float(havven_model.market_manager.nomin_fiat_market.lowest_ask_price())
+
+
+def nomin_bid(havven_model: "model.HavvenModel") -> float:
+    """Return the highest nomin/fiat bid price."""
+    return float(havven_model.market_manager.nomin_fiat_market.highest_bid_price())
+
+
+def havven_price(havven_model: "model.HavvenModel") -> float:
+    """Return the rolling average havven/fiat price."""
+    return float(havven_model.market_manager.havven_fiat_market.price)
+
+
+def havven_ask(havven_model: "model.HavvenModel") -> float:
+    """Return the lowest havven/fiat ask price."""
+    return float(havven_model.market_manager.havven_fiat_market.lowest_ask_price())
+
+
+def havven_bid(havven_model: "model.HavvenModel") -> float:
+    """Return the highest havven/fiat bid price."""
+    return float(havven_model.market_manager.havven_fiat_market.highest_bid_price())
+
+
+def havven_nomin_price(havven_model: "model.HavvenModel") -> float:
+    """Return the rolling average havven/nomin price."""
+    return float(havven_model.market_manager.havven_nomin_market.price)
+
+
+def havven_nomin_ask(havven_model: "model.HavvenModel") -> float:
+    """Return the lowest havven/nomin ask price."""
+    return float(havven_model.market_manager.havven_nomin_market.lowest_ask_price())
+
+
+def havven_nomin_bid(havven_model: "model.HavvenModel") -> float:
+    """Return the highest havven/nomin bid price."""
+    return float(havven_model.market_manager.havven_nomin_market.highest_bid_price())
+
+
+def havven_nomins(havven_model: "model.HavvenModel") -> float:
+    """Return the quantity of nomins held by the Havven system; this is also its fee pool."""
+    return float(havven_model.manager.nomins)
+
+
+def havven_havvens(havven_model: "model.HavvenModel") -> float:
+    """Return the quantity of havvens held by the Havven system."""
+    return float(havven_model.manager.havvens)
+
+
+def havven_fiat(havven_model: "model.HavvenModel") -> float:
+    """Return the quantity of fiat held by the Havven system."""
+    return float(havven_model.manager.fiat)
+
+
+def total_nomins(havven_model: "model.HavvenModel") -> float:
+    """Return the total nomin supply."""
+    return float(havven_model.manager.nomin_supply)
+
+
+def escrowed_havvens(havven_model: "model.HavvenModel") -> float:
+    """Return the total quantity of escrowed havvens."""
+    return float(havven_model.manager.escrowed_havvens)
+
+
+def avg_profit_percentage(havven_model: "model.HavvenModel") -> float:
+    """Return the average profit of market participants as a percentage, to 3 places."""
+    return profit_percentages(havven_model)[0]
+
+
+def fees_distributed(havven_model: "model.HavvenModel") -> float:
+    """Return the total quantity of fees distributed so far."""
+    return float(havven_model.fee_manager.fees_distributed)
+
+
+def nomin_fiat_order_book(havven_model: "model.HavvenModel") -> "ob.OrderBook":
+    """Return the nomin/fiat order book itself, for the visualisations to render."""
+    return havven_model.market_manager.nomin_fiat_market
+
+
+def havven_fiat_order_book(havven_model: "model.HavvenModel") -> "ob.OrderBook":
+    """Return the havven/fiat order book itself, for the visualisations to render."""
+    return havven_model.market_manager.havven_fiat_market
+
+
+def havven_nomin_order_book(havven_model: "model.HavvenModel") -> "ob.OrderBook":
+    """Return the havven/nomin order book itself, for the visualisations to render."""
+    return havven_model.market_manager.havven_nomin_market
+
+
 def create_datacollector() -> DataCollector:
     base_reporters = {
-        "0": lambda x: 0,  # Note: workaround for showing labels (more info server.py)
-        "1": lambda x: 1,
-        "Nomin Price": lambda h: float(h.market_manager.nomin_fiat_market.price),
-        "Nomin Ask": lambda h: float(h.market_manager.nomin_fiat_market.lowest_ask_price()),
-        "Nomin Bid": lambda h: float(h.market_manager.nomin_fiat_market.highest_bid_price()),
-        "Havven Price": lambda h: float(h.market_manager.havven_fiat_market.price),
-        "Havven Ask": lambda h: float(h.market_manager.havven_fiat_market.lowest_ask_price()),
-        "Havven Bid": lambda h: float(h.market_manager.havven_fiat_market.highest_bid_price()),
-        "Havven/Nomin Price": lambda h: float(h.market_manager.havven_nomin_market.price),
-        "Havven/Nomin Ask": lambda h: float(h.market_manager.havven_nomin_market.lowest_ask_price()),
-        "Havven/Nomin Bid": lambda h: float(h.market_manager.havven_nomin_market.highest_bid_price()),
-        "Havven Nomins": lambda h: float(h.manager.nomins),
-        "Havven Havvens": lambda h: float(h.manager.havvens),
-        "Havven Fiat": lambda h: float(h.manager.fiat),
+        "Nomin Price": nomin_price,
+        "Nomin Ask": nomin_ask,
+        "Nomin Bid": nomin_bid,
+        "Havven Price": havven_price,
+        "Havven Ask": havven_ask,
+        "Havven Bid": havven_bid,
+        "Havven/Nomin Price": havven_nomin_price,
+        "Havven/Nomin Ask": havven_nomin_ask,
+        "Havven/Nomin Bid": havven_nomin_bid,
+        "Havven Nomins": havven_nomins,
+        "Havven Havvens": havven_havvens,
+        "Havven Fiat": havven_fiat,
         "Gini": gini,
-        "Nomins": lambda h: float(h.manager.nomin_supply),
-        "Escrowed Havvens": lambda h: float(h.manager.escrowed_havvens),
+        "Nomins": total_nomins,
+        "Escrowed Havvens": escrowed_havvens,
         #"Wealth SD": stats.wealth_sd,
         "Max Wealth": max_wealth,
         "Min Wealth": min_wealth,
-        "Avg Profit %": lambda h: round(100 * mean_profit_fraction(h), 3),
+        "Avg Profit %": avg_profit_percentage,
         "Havven Demand": havven_demand,
         "Havven Supply": havven_supply,
         "Nomin Demand": nomin_demand,
         "Nomin Supply": nomin_supply,
         "Fiat Demand": fiat_demand,
         "Fiat Supply": fiat_supply,
-        "Fee Pool": lambda h: float(h.manager.nomins),
-        "Fees Distributed": lambda h: float(h.fee_manager.fees_distributed),
-        "NominFiatOrderBook": lambda h: h.market_manager.nomin_fiat_market,
-        "HavvenFiatOrderBook": lambda h: h.market_manager.havven_fiat_market,
-        "HavvenNominOrderBook": lambda h: h.market_manager.havven_nomin_market
+        "Fee Pool": havven_nomins,
+        "Fees Distributed": fees_distributed,
+        "NominFiatOrderBook": nomin_fiat_order_book,
+        "HavvenFiatOrderBook": havven_fiat_order_book,
+        "HavvenNominOrderBook": havven_nomin_order_book
     }
 
     agent_reporters = {}
     for name in agents.player_names:
         if name not in agents.players_to_exclude:
-            agent_reporters[name] = lambda h, y=name: round(mean_agent_profit_fraction(y, h)*100, 3)
+            agent_reporters[name] = lambda h, y=name: profit_percentages(h)[1][y]
 
     base_reporters.update(agent_reporters)
 
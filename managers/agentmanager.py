@@ -50,13 +50,21 @@ class AgentManager:
                 int(num_agents*agent_fractions[agent_type])
             )
 
+            # Look this up once per agent type, not once per agent.
+            agent_class = ag.player_names[agent_type]
+
+            # Some agents trade as they are created, so set each one up in turn,
+            #   but schedule the whole group at once.
+            new_agents = []
             for i in range(total):
-                agent = ag.player_names[agent_type](running_player_total, self.havven_model)
+                agent = agent_class(running_player_total, self.havven_model)
                 agent.setup(self.wealth_parameter)
-                self.havven_model.schedule.add(agent)
-                self.agents[agent_type].append(agent)
+                new_agents.append(agent)
                 running_player_total += 1
 
+            self.havven_model.schedule.extend(new_agents)
+            self.agents[agent_type].extend(new_agents)
+
         # Add a central stabilisation bank
         # self._add_central_bank(running_player_total, self.num_agents, self.wealth_parameter)
 
@@ -66,19 +74,14 @@ class AgentManager:
 
     def add(self, agent):
         self.havven_model.schedule.add(agent)
-        for name, item in ag.player_names.items():
-            if type(agent) == item:
-                self.agents[name].append(agent)
-                return
-        else:
-            self.agents['others'].append(agent)
+        self.agents[ag.player_types.get(type(agent), 'others')].append(agent)
 
     def _add_central_bank(self, unique_id, num_agents, init_value):
+        endowment = Dec(num_agents * init_value)
         central_bank = ag.CentralBank(
-            unique_id, self.havven_model, fiat=Dec(num_agents * init_value),
+            unique_id, self.havven_model, fiat=endowment,
             nomin_target=Dec('1.0')
         )
-        self.havven_model.endow_havvens(central_bank,
-                                 Dec(num_agents * init_value))
+        self.havven_model.endow_havvens(central_bank, endowment)
         self.havven_model.schedule.add(central_bank)
         self.agents["others"].append(central_bank)
@@ -1,6 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from decimal import Decimal as Dec
-from random import shuffle
+from random import Random, shuffle
 
 import agents 
 from .havvenmanager import HavvenManager
@@ -83,9 +83,11 @@ class FeeManager:
         """
         return HavvenManager.round_decimal(quantity * self.nomin_fee_rate)
 
-    def distribute_fees(self, schedule_agents: List["agents.MarketPlayer"]) -> None:
+    def distribute_fees(self, schedule_agents: List["agents.MarketPlayer"],
+                        rng: Optional[Random] = None) -> None:
         """
         Distribute currently held nomins to holders of havvens.
+        The recipients are shuffled with rng if given, otherwise the global generator.
         """
         # Different fee modes:
         #  * distributed by held havvens
@@ -96,7 +98,10 @@ class FeeManager:
         # reward in random order in case there's
         # some ordering bias I'm missing.
         shuffled_agents = list(schedule_agents)
-        shuffle(shuffled_agents)
+        if rng is not None:
+            rng.shuffle(shuffled_agents)
+        else:
+            shuffle(shuffled_agents)
 
         pre_nomins = self.model_manager.nomins
         supply = self.model_manager.nomin_supply
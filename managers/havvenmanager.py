@@ -14,6 +14,9 @@ class HavvenManager:
     The decimal context precision should be significantly higher than this.
     """
 
+    currency_quantum = Dec(1).scaleb(-currency_precision)
+    """The smallest representable quantity of currency, 1E-8."""
+
     def __init__(self, utilisation_ratio_max: Dec,
                  continuous_order_matching: bool, havven_settings: Dict[str, Any]) -> None:
         """
@@ -25,6 +28,7 @@ class HavvenManager:
          - rolling_avg_time_window: the amount of steps to consider when calculating the
          rolling price average
          - use_volume_weighted_avg: whether to use volume in calculating the rolling price average
+         - trade_history: the number of recent trades each player keeps, or 0 for all of them
         """
         # Set the decimal rounding mode
         getcontext().rounding = ROUND_HALF_UP
@@ -53,6 +57,11 @@ class HavvenManager:
         self.volume_weighted_average: bool = havven_settings['use_volume_weighted_avg']
         """Whether to calculate the rolling average taking into account the volume of the trades"""
 
+        self.trade_history: int = havven_settings['trade_history']
+        """The number of recent trades each player keeps a record of; 0 keeps every trade."""
+        if self.trade_history < 0:
+            raise ValueError(f"trade_history must not be negative, got {self.trade_history}")
+
     @classmethod
     def round_float(cls, value: float) -> Dec:
         """
@@ -78,4 +87,7 @@ class HavvenManager:
         # be commented out for now as it seems to kill economic activity.
         # if value < Dec('1E-8'):
         #     return Dec(0)
+        if type(value) is Dec:
+            # Quantize directly, rather than constructing the quantum on every call.
+            return value.quantize(cls.currency_quantum)
         return round(value, cls.currency_precision)
@@ -46,6 +46,9 @@ class MarketManager:
             self.model_manager.continuous_order_matching
         )
 
+        # Every order book, in the order they are stepped and matched.
+        self.markets = (self.havven_nomin_market, self.havven_fiat_market, self.nomin_fiat_market)
+
     def __bid_ask_match(
             self, bid: "ob.Bid", ask: "ob.Ask",
             bid_success: Callable[["ag.MarketPlayer", Dec, Dec], bool],
@@ -196,13 +199,18 @@ class MarketManager:
             return True
         return False
 
+    @staticmethod
+    def value_at(quantity: Dec, price: Dec) -> Dec:
+        """Return the rounded value of a quantity of some currency at the given price."""
+        return HavvenManager.round_decimal(quantity * price)
+
     def havvens_to_nomins(self, quantity: Dec) -> Dec:
         """Convert a quantity of havvens to its equivalent quantity in nomins."""
         return HavvenManager.round_decimal(quantity * self.havven_nomin_market.price)
 
     def havvens_to_fiat(self, quantity: Dec) -> Dec:
         """Convert a quantity of havvens to its equivalent quantity in fiat."""
-        return HavvenManager.round_decimal(quantity * self.havven_fiat_market.price)
+        return self.value_at(quantity, self.havven_fiat_market.price)
 
     def nomins_to_havvens(self, quantity: Dec) -> Dec:
         """Convert a quantity of nomins to its equivalent quantity in havvens."""
@@ -210,7 +218,7 @@ class MarketManager:
 
     def nomins_to_fiat(self, quantity: Dec) -> Dec:
         """Convert a quantity of nomins to its equivalent quantity in fiat."""
-        return HavvenManager.round_decimal(quantity * self.nomin_fiat_market.price)
+        return self.value_at(quantity, self.nomin_fiat_market.price)
 
     def fiat_to_havvens(self, quantity: Dec) -> Dec:
         """Convert a quantity of fiat to its equivalent quantity in havvens."""
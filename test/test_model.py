@@ -1,6 +1,8 @@
 from decimal import Decimal as Dec
 
-from core import model
+import pytest
+
+from core import model, settingsloader
 
 
 def test_fiat_value():
@@ -69,3 +71,67 @@ def test_fee_distribution_period():
     assert(prenomins <= postdistrib)
     assert(havven_model.manager.nomins == Dec(0))
 
+
+def test_seed_reproducible():
+    def run(seed):
+        settings = settingsloader.get_defaults()
+        model_settings = settings['Model']
+        model_settings['agent_fractions'] = settings['AgentFractions']
+        model_settings['num_agents'] = 20
+        havven_model = model.HavvenModel(model_settings, settings['Fees'], settings['Agents'],
+                                         settings['Havven'], seed=seed)
+        for _ in range(10):
+            havven_model.step()
+        return [a.wealth() for a in havven_model.schedule.agents]
+
+    assert(run(1) == run(1))
+    assert(run(1) != run(2))
+
+    settings = settingsloader.get_defaults()
+    model_settings = settings['Model']
+    model_settings['agent_fractions'] = settings['AgentFractions']
+    with pytest.raises(TypeError):
+        model.HavvenModel(model_settings, settings['Fees'], settings['Agents'], settings['Havven'], 1)
+
+
+def make_settings(num_agents=20):
+    settings = settingsloader.get_defaults()
+    settings['Model']['agent_fractions'] = settings['AgentFractions']
+    settings['Model']['num_agents'] = num_agents
+    return settings
+
+
+def make_model(settings):
+    return model.HavvenModel(settings['Model'], settings['Fees'],
+                             settings['Agents'], settings['Havven'], seed=1)
+
+
+def test_trade_history():
+    settings = make_settings()
+    settings['Havven']['trade_history'] = 3
+    havven_model = make_model(settings)
+    for _ in range(30):
+        havven_model.step()
+    assert(sum(len(a.trades) for a in havven_model.schedule.agents) > 0)
+    assert(all(len(a.trades) <= 3 for a in havven_model.schedule.agents))
+
+    settings = make_settings()
+    settings['Havven']['trade_history'] = -1
+    with pytest.raises(ValueError):
+        make_model(settings)
+
+
+def test_collect_period():
+    settings = make_settings()
+    settings['Model']['collect_period'] = 4
+    havven_model = make_model(settings)
+    start = havven_model.manager.time
+    for _ in range(21):
+        havven_model.step()
+    collected_ticks = [t for t in range(start, start + 21) if t % 4 == 0]
+    assert(len(havven_model.datacollector.model_vars['Gini']) == len(collected_ticks))
+
+    settings = make_settings()
+    settings['Model']['collect_period'] = 0
+    with pytest.raises(ValueError):
+        make_model(settings)
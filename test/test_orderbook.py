@@ -633,6 +633,48 @@ def nomin_fiat_ask_match_check(player_info):
             assert item is others[0]['bid']
 
 
+"""
+===========================================
+= Testing batch cancellation
+===========================================
+
+Alice has a few orders on the nomin/fiat market, and Bob has one.
+Alice cancels all of hers at once; Bob's should be untouched.
+"""
+
+
+def test_cancel_orders():
+    havven_model, alice, bob, charlie = place_nom_fiat_limit_sell_setup(Dec(1000))
+    alice.fiat = Dec(1000)
+    book = havven_model.market_manager.nomin_fiat_market
+
+    place_nomin_fiat_ask(havven_model, alice, Dec(100), Dec('1.1'), True)
+    place_nomin_fiat_ask(havven_model, alice, Dec(50), Dec('1.2'), True)
+    place_nomin_fiat_bid(havven_model, alice, Dec(100), Dec('0.9'), True)
+    bob_bid = place_nomin_fiat_bid(havven_model, bob, Dec(100), Dec('0.95'), True)
+    alice_orders = list(alice.orders)
+    assert len(alice_orders) == 3
+
+    alice.cancel_orders()
+
+    assert len(alice.orders) == 0
+    assert all(not order.active for order in alice_orders)
+    assert alice.unavailable_nomins == 0
+    assert alice.unavailable_fiat == 0
+    assert alice.available_nomins == Dec(1000)
+    assert alice.available_fiat == Dec(1000)
+
+    assert bob_bid.active
+    assert bob.orders == [bob_bid]
+    assert list(book.bids) == [bob_bid]
+    assert len(book.asks) == 0
+    assert list(book.bid_price_buckets.items()) == [(bob_bid.price, bob_bid.quantity)]
+    assert len(book.ask_price_buckets) == 0
+
+    # Cancelling already-cancelled orders does nothing.
+    book.cancel_orders(alice_orders)
+    assert bob_bid.active
+
 """
 TODO: test more precises prices eg. ask:100@1.32451234
 TODO: testing buy limits thoroughly